@@ -0,0 +1,237 @@
+# college_data.py
+"""
+Shared data helpers for the two dashboards.
+
+The facility compliance form ("Form Responses 1") and the monitoring action
+log describe the same colleges, but college names are typed by hand in both
+sheets. Everything here matches them through a normalized college key so the
+two datasets can be hash-joined instead of compared row by row.
+"""
+import re
+
+import gspread
+import numpy as np
+import pandas as pd
+import streamlit as st
+from google.oauth2.service_account import Credentials
+
+# ---------------------- SOURCES ----------------------
+COMPLIANCE_SHEET_NAME = "Special Monitoring of Govt. Colleges  (Responses)"
+COMPLIANCE_WORKSHEET_NAME = "Form Responses 1"
+ACTION_SHEET_URL = "https://docs.google.com/spreadsheets/d/1CaRv9M_Xvs0xu0RSWR_NGvNE0SGC3XqCzoEbqQAuoqc/edit"
+
+# Sheets are re-read at most every five minutes, like the old full-page autorefresh
+CACHE_TTL = 300
+
+# Facility question → icon shown on the compliance tiles
+FACILITY_COLS = {
+    "Classrooms cleaned, ventilated, and furniture arranged?": "class.jpg",
+    "Toilets cleaned, functional, and with water supply?": "toilets.jpg",
+    "Drinking water availability and quality check?": "water.jpg",
+    "Electricity and lighting functional in classrooms and labs?": "electricity.jpg",
+    "Campus grounds cleaned (lawns, courtyards, pathways)?": "grounds.jpg",
+    "Boundary wall and gates secured (no open or broken sections)?": "boundry.jpg",
+    "Science labs ready with basic equipment and chemicals?": "science.jpg",
+    "IT/Computer labs functional (systems, internet, power)?": "it.jpg",
+    "Library operational clean and open for students?": "library.jpg",
+    "Biometric Attendance Device installed and functional?": "bio.jpg",
+    "Principal and administration staff presence on reopening day?": 'attendance.jpg',
+    "Students attendance registers available and ready?": "students.jpg"
+}
+
+# Column F of the compliance form holds the college name
+COMPLIANCE_COLLEGE_POSITION = 5
+
+# Failures reading the other dashboard's sheet; these only hide the
+# "Compliance vs Actions" section, never the whole page
+CROSS_SHEET_ERRORS = (
+    gspread.exceptions.APIError,
+    gspread.exceptions.SpreadsheetNotFound,
+    gspread.exceptions.WorksheetNotFound,
+    KeyError,
+)
+
+# ---------------------- COLLEGE KEYS ----------------------
+
+_GOVT_SPELLINGS = re.compile(r"\b(?:govt|govn?|gvt|goverment|government)\b")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def college_key(name):
+    """
+    Normalize a college name so that spelling variants share one key:
+    case and punctuation are ignored and 'Govt.', 'Gov', 'Government' etc.
+    all collapse to 'government'.
+    """
+    if name is None or (not isinstance(name, str) and pd.isna(name)):
+        return ""
+    key = str(name).lower().replace("&", " and ")
+    key = _NON_ALNUM.sub(" ", key)
+    key = _GOVT_SPELLINGS.sub("government", key)
+    return " ".join(key.split())
+
+
+# ---------------------- COMPLIANCE ----------------------
+
+def add_compliance(data: pd.DataFrame):
+    """Convert the facility Yes/No answers to 1/0 and add 'Compliance %' per response."""
+    for col in FACILITY_COLS.keys():
+        data[col] = data[col].apply(lambda x: 1 if str(x).strip().lower() == "yes" else 0)
+    data["Compliance %"] = (data[list(FACILITY_COLS.keys())].mean(axis=1) * 100).round(0)
+    return data
+
+
+# ---------------------- LOADING ----------------------
+
+def _authorize(scope):
+    creds = Credentials.from_service_account_info(
+        st.secrets["gcp_service_account"], scopes=scope
+    )
+    return gspread.authorize(creds)
+
+
+def merge_duplicate_columns(df: pd.DataFrame):
+    """
+    Properly merge duplicate columns (like 'Action', 'Action_1', 'Action_2', etc.)
+    by taking the first non-empty value in each row across all duplicates.
+    Works even if Google Sheets repeated headers multiple times.
+    """
+    merged_df = df.copy()
+    base_map = {}
+
+    for col in merged_df.columns:
+        base = re.sub(r'[_\.\s]*\d+$', '', col.strip())
+        base_map.setdefault(base, []).append(col)
+
+    for base, cols in base_map.items():
+        if len(cols) > 1:
+            merged_df[base] = merged_df[cols].apply(
+                lambda row: next((x for x in row if pd.notna(x) and str(x).strip() != ''), ''),
+                axis=1
+            )
+            merged_df.drop(columns=[c for c in cols if c != base], inplace=True)
+
+    return merged_df
+
+
+def action_frame(rows):
+    """Build the action log DataFrame from raw sheet values (header row first)."""
+    headers = rows[0]
+    data = rows[1:]
+
+    # Handle duplicate headers
+    unique_headers = []
+    seen = {}
+    for h in headers:
+        if h in seen:
+            seen[h] += 1
+            unique_headers.append(f"{h}_{seen[h]}")
+        else:
+            seen[h] = 0
+            unique_headers.append(h)
+
+    df = pd.DataFrame(data, columns=unique_headers)
+
+    # Clean column names
+    df.columns = [c.strip().replace("-", "_") for c in df.columns]
+
+    # Merge duplicate logical columns
+    df = merge_duplicate_columns(df)
+
+    # Ensure essential columns exist
+    for col in ['Scale', 'Reason', 'Category']:
+        if col not in df.columns:
+            df[col] = np.nan
+
+    df['Scale'] = pd.to_numeric(df['Scale'], errors='coerce')
+
+    return df
+
+
+@st.cache_data(ttl=CACHE_TTL)
+def load_action_records(sheet_url=ACTION_SHEET_URL):
+    """Action log for the compliance dashboard, cached for one refresh cycle."""
+    client = _authorize(["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"])
+    rows = client.open_by_url(sheet_url).sheet1.get_all_values()
+    if not rows:
+        return pd.DataFrame(columns=['College Name', 'Action', 'Salary Deducted'])
+    return action_frame(rows)
+
+
+@st.cache_data(ttl=CACHE_TTL)
+def load_compliance_records(sheet_name=COMPLIANCE_SHEET_NAME, worksheet_name=COMPLIANCE_WORKSHEET_NAME):
+    """Facility responses for the action dashboard, with 'Compliance %' per row."""
+    client = _authorize(["https://www.googleapis.com/auth/spreadsheets",
+                         "https://www.googleapis.com/auth/drive"])
+    ws = client.open(sheet_name).worksheet(worksheet_name)
+    data = pd.DataFrame(ws.get_all_records())
+    if data.empty:
+        return data
+    data.columns = [col.strip() for col in data.columns]
+    return add_compliance(data)
+
+
+# ---------------------- JOIN ----------------------
+
+def summarize_actions(actions: pd.DataFrame, college_col='College Name'):
+    """Per-college action counts and salary deductions, indexed by college key."""
+    columns = ['College', 'Actions', 'Warnings', 'Salary Deducted']
+    if actions.empty or college_col not in actions.columns:
+        return pd.DataFrame(columns=columns).rename_axis('key')
+
+    action = actions['Action'].astype(str) if 'Action' in actions.columns else pd.Series('', index=actions.index)
+    salary = (pd.to_numeric(actions['Salary Deducted'], errors='coerce')
+              if 'Salary Deducted' in actions.columns else pd.Series(0.0, index=actions.index))
+
+    rows = pd.DataFrame({
+        'key': actions[college_col].map(college_key),
+        'College': actions[college_col],
+        'Actions': 1,
+        'Warnings': action.str.contains('Warning', case=False, na=False).astype(int),
+        # Same rule as the "Salary Deduction" KPI: only rows whose action is a deduction
+        'Salary Deducted': salary.where(action.str.contains('Salary', case=False, na=False), 0).fillna(0),
+    })
+    rows = rows[rows['key'] != '']
+    return rows.groupby('key', sort=False).agg(
+        College=('College', 'first'),
+        Actions=('Actions', 'sum'),
+        Warnings=('Warnings', 'sum'),
+        **{'Salary Deducted': ('Salary Deducted', 'sum')},
+    )
+
+
+def summarize_compliance(compliance: pd.DataFrame, college_col):
+    """Mean 'Compliance %' per college across its visits, indexed by college key."""
+    rows = pd.DataFrame({
+        'key': compliance[college_col].map(college_key),
+        'College': compliance[college_col],
+        'Compliance %': compliance['Compliance %'],
+    })
+    rows = rows[rows['key'] != '']
+    return rows.groupby('key', sort=False).agg(
+        College=('College', 'first'),
+        **{'Compliance %': ('Compliance %', 'mean')},
+    )
+
+
+def join_compliance_actions(compliance: pd.DataFrame, compliance_college_col,
+                            actions: pd.DataFrame, action_college_col='College Name', how='left'):
+    """
+    Put each college's compliance next to its action counts and salary deducted.
+
+    Both sides are grouped by college key and joined on that key, so the cost
+    is linear in the number of rows. `how='left'` keeps every college from the
+    compliance form, `how='right'` every college from the action log.
+    """
+    left = summarize_compliance(compliance, compliance_college_col)
+    right = summarize_actions(actions, action_college_col)
+
+    joined = left.join(right, how=how, lsuffix='', rsuffix=' (action log)')
+    joined['College'] = joined['College'].fillna(joined.pop('College (action log)'))
+    for col in ['Actions', 'Warnings', 'Salary Deducted']:
+        joined[col] = joined[col].fillna(0).astype(int)
+    joined['Compliance %'] = joined['Compliance %'].round(0)
+
+    return (joined[['College', 'Compliance %', 'Actions', 'Warnings', 'Salary Deducted']]
+            .sort_values(['Compliance %', 'Actions'], ascending=[True, False], na_position='last')
+            .reset_index(drop=True))
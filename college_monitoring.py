@@ -1,14 +1,16 @@
 import base64
+import hashlib
 import os
 import streamlit as st
 import pandas as pd
 from google.oauth2.service_account import Credentials
 import gspread
-# Load data
-from streamlit_autorefresh import st_autorefresh
+from college_data import (CACHE_TTL, COMPLIANCE_SHEET_NAME, CROSS_SHEET_ERRORS, COMPLIANCE_WORKSHEET_NAME, FACILITY_COLS,
+                          add_compliance, join_compliance_actions, load_action_records)
 # -----------------------------
 # Page Config
 # -----------------------------
+@st.cache_data
 def get_base64_image(image_path):
     with open(image_path, "rb") as f:
         return base64.b64encode(f.read()).decode()
@@ -47,13 +49,55 @@ creds = Credentials.from_service_account_info(
 )
 gc = gspread.authorize(creds)
 
-sheet_name = "Special Monitoring of Govt. Colleges  (Responses)"
-worksheet_name = "Form Responses 1"
+sheet_name = COMPLIANCE_SHEET_NAME
+worksheet_name = COMPLIANCE_WORKSHEET_NAME
 sh = gc.open(sheet_name)
 ws = sh.worksheet(worksheet_name)
 
-st_autorefresh(interval=300 * 1000, key="datarefresh")
-data = pd.DataFrame(ws.get_all_records())
+@st.cache_data(ttl=CACHE_TTL)
+def load_responses(_ws):
+    """All form responses, shared by every session for one refresh cycle."""
+    return pd.DataFrame(_ws.get_all_records())
+
+
+def load_actions():
+    """The action log, or None when it can't be read; only its own section needs it."""
+    try:
+        return load_action_records()
+    except CROSS_SHEET_ERRORS:
+        return None
+
+
+@st.cache_data(ttl=CACHE_TTL)
+def snapshot_version(_ws):
+    """
+    Fingerprint of both sheets; changes when any cell of either one does.
+    Computed once per refresh cycle and shared by every session, so polling
+    it only compares two strings.
+    """
+    digest = hashlib.sha1()
+    for frame in (load_responses(_ws), load_actions()):
+        if frame is not None:
+            digest.update(pd.util.hash_pandas_object(frame).values.tobytes())
+    return digest.hexdigest()
+
+
+@st.fragment(run_every=60)
+def watch_for_changes():
+    """Rerun the page only when the responses or the action log changed since it was drawn."""
+    if st.session_state.pop("snapshot_checked", False):
+        return  # the full run that just drew the page already looked the version up
+    if snapshot_version(ws) != st.session_state.get("snapshot_version"):
+        st.rerun()
+
+
+st.session_state["snapshot_version"] = snapshot_version(ws)
+st.session_state["snapshot_checked"] = True
+watch_for_changes()
+
+data = load_responses(ws)
+actions = load_actions()
+
 data.columns = [col.strip() for col in data.columns]
 
 # -----------------------------
@@ -68,20 +112,7 @@ col_officer = data.columns[18]   # S (if exists)
 # -----------------------------
 # Facility Columns
 # -----------------------------
-facility_cols = {
-    "Classrooms cleaned, ventilated, and furniture arranged?": "class.jpg",
-    "Toilets cleaned, functional, and with water supply?": "toilets.jpg",
-    "Drinking water availability and quality check?": "water.jpg",
-    "Electricity and lighting functional in classrooms and labs?": "electricity.jpg",
-    "Campus grounds cleaned (lawns, courtyards, pathways)?": "grounds.jpg",
-    "Boundary wall and gates secured (no open or broken sections)?": "boundry.jpg",
-    "Science labs ready with basic equipment and chemicals?": "science.jpg",
-    "IT/Computer labs functional (systems, internet, power)?": "it.jpg",
-    "Library operational clean and open for students?": "library.jpg",
-    "Biometric Attendance Device installed and functional?": "bio.jpg",
-    "Principal and administration staff presence on reopening day?": 'attendance.jpg',
-    "Students attendance registers available and ready?": "students.jpg"
-}
+facility_cols = FACILITY_COLS
 facility_label = [
     "Classrooms cleaned, ventilated?",
     "Toilets cleaned, functional?",
@@ -97,9 +128,8 @@ facility_label = [
     "Student Attendance Registers Ready?"
 ]
 
-# Convert yes/no → 1/0
-for col in facility_cols.keys():
-    data[col] = data[col].apply(lambda x: 1 if str(x).strip().lower() == "yes" else 0)
+# Convert yes/no → 1/0 and calculate compliance per row
+data = add_compliance(data)
 
 # -----------------------------
 # Top Summary Cards
@@ -269,8 +299,6 @@ div[data-testid="stButton"]:nth-of-type(2) > button {
 # -----------------------------
 filtered = data.copy()
 
-# Calculate compliance early for filtering
-filtered["Compliance %"] = (filtered[list(facility_cols.keys())].mean(axis=1) * 100).round(0)
 if apply:
     if selected_district != "All":
         filtered = filtered[filtered[col_district] == selected_district]
@@ -356,8 +384,6 @@ for i, (facility, icon_file) in enumerate(facility_cols.items()):
 # -----------------------------
 st.markdown("### 📋 Detailed College List")
 
-# Calculate compliance per row
-filtered["Compliance %"] = (filtered[list(facility_cols.keys())].mean(axis=1) * 100).round(0)
 def compliance_badge(val):
     """Return HTML span with background only behind text (not whole cell)."""
     try:
@@ -455,3 +481,26 @@ st.markdown(
     """,
     unsafe_allow_html=True,
 )
+
+# -----------------------------
+# Compliance vs Disciplinary Actions
+# -----------------------------
+st.markdown("### ⚖️ Compliance vs Actions Taken")
+
+compliance_actions = None
+if actions is not None:
+    try:
+        compliance_actions = join_compliance_actions(filtered, col_college, actions)
+    except CROSS_SHEET_ERRORS:
+        pass
+
+if compliance_actions is None:
+    st.warning("The monitoring action log could not be read, so this section is skipped.")
+else:
+    compliance_actions["Compliance %"] = compliance_actions["Compliance %"].apply(lambda x: f"{int(x)}%")
+
+    st.dataframe(
+        compliance_actions,
+        height=400,
+        hide_index=True
+    )
@@ -0,0 +1,367 @@
+# load_test.py
+"""
+Concurrent-session load test for both dashboards.
+
+Drives college_monitoring.py and monitoring_action_report_dashboard_streamlit.py
+headlessly with Streamlit's AppTest. Google Sheets is replaced by a local
+fixture, so the numbers measure the dashboards themselves and not the Sheets API.
+
+Every simulated session runs a realistic sequence of filter, search and
+download reruns in its own worker process: AppTest swaps the global st.secrets
+on every run, so sessions cannot safely share a process. As a consequence each
+session also has its own st.cache_data, unlike a single Streamlit server. For
+each session count the report gives p50/p95/p99 rerun latency and CPU time.
+
+Memory is reported in two ways. "proc MB" is the summed RSS of the worker
+processes. It includes one interpreter plus Streamlit, pandas, plotly and
+gspread per session, so it is not a server size. "MB/sess" is what one
+session adds above its worker's RSS after those imports. "est. MB" is one
+such baseline plus all session increments, as a single-process server would
+hold them.
+
+    python load_test.py --sessions 1 5 10 20 --iterations 3
+    python load_test.py --app actions --colleges 800 --json results.json
+    python load_test.py --sessions 10 --fail-p95-ms 1500   # exit 1 on regression
+"""
+import argparse
+import csv
+import importlib
+import json
+import math
+import os
+import random
+import multiprocessing
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+from streamlit.testing.v1 import AppTest
+
+from college_data import FACILITY_COLS
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+APPS = {
+    "compliance": "college_monitoring.py",
+    "actions": "monitoring_action_report_dashboard_streamlit.py",
+}
+
+# ---------------------- FIXTURE DATA SOURCE ----------------------
+
+DISTRICTS = ["Lahore", "Faisalabad", "Multan", "Rawalpindi", "Gujranwala", "Sargodha", "Bahawalpur", "Sahiwal"]
+ACTIONS = ["Warning", "Salary Deduction", "Showcause Notice", "Explanation Called", "Inquiry Initiated", "Facility Update"]
+REASONS = ["Habitual Absentiesm", "Proxy Attendance", "Staff absent during monitoring visit"]
+
+# Both sheets type the college name by hand; the fixture does the same
+NAME_SPELLINGS = [
+    "Govt. {} College No. {}, {}",
+    "Government {} College No {} {}",
+    "GOVT {} college no.{} ({})",
+    "Gov {} College - No. {} - {}",
+]
+
+COMPLIANCE_HEADERS = (
+    ["Timestamp", "Email Address", "District", "College Gender", "College Type", "College Name"]
+    + list(FACILITY_COLS.keys())
+    + ["Monitoring Officer"]
+)
+ACTION_HEADERS = [
+    "Timestamp", "Email Address", "Action Taken for the Month", "District", "College Name",
+    "College Gender", "College Type", "Category", "Action", "Reason", "Action By", "Salary Deducted", "Scale",
+]
+
+
+def generate_fixture(colleges, actions_per_college, seed=0):
+    """Synthetic compliance and action sheets as lists of rows (header first)."""
+    rng = random.Random(seed)
+    compliance_rows = [COMPLIANCE_HEADERS]
+    action_rows = [ACTION_HEADERS]
+
+    for i in range(colleges):
+        district = DISTRICTS[i % len(DISTRICTS)]
+        gender = "Male" if i % 2 else "Female"
+        kind = "Commerce" if i % 5 == 0 else "General"
+        college = ("Female" if gender == "Female" else "Boys", i + 1, district)
+
+        compliance_rows.append(
+            ["2025-09-15 09:00:00", f"officer{i}@hed.gop.pk", district, gender, kind,
+             rng.choice(NAME_SPELLINGS).format(*college)]
+            + [rng.choice(["Yes", "Yes", "Yes", "No"]) for _ in FACILITY_COLS]
+            + [f"Officer {i % 40}"]
+        )
+        for _ in range(rng.randint(0, 2 * actions_per_college)):
+            action = rng.choice(ACTIONS)
+            action_rows.append([
+                "2025-10-01 10:00:00", "cell@hed.gop.pk", "October", district,
+                rng.choice(NAME_SPELLINGS).format(*college),
+                gender, kind, "Facility" if action == "Facility Update" else "Staff",
+                action, rng.choice(REASONS), "Monitoring Cell",
+                str(rng.choice([5000, 10000, 15000])) if action == "Salary Deduction" else "",
+                str(rng.randint(14, 20)),
+            ])
+
+    return compliance_rows, action_rows
+
+
+def read_fixture(fixture_dir):
+    """Load compliance.csv and actions.csv exported from the two sheets."""
+    sheets = []
+    for name in ("compliance.csv", "actions.csv"):
+        with open(os.path.join(fixture_dir, name), newline="", encoding="utf-8") as f:
+            sheets.append(list(csv.reader(f)))
+    return sheets
+
+
+class FixtureWorksheet:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def get_all_values(self):
+        return [list(row) for row in self._rows]
+
+    def get_all_records(self):
+        headers = self._rows[0]
+        return [dict(zip(headers, row)) for row in self._rows[1:]]
+
+
+class FixtureSpreadsheet:
+    def __init__(self, rows):
+        self.sheet1 = FixtureWorksheet(rows)
+
+    def worksheet(self, name):
+        return self.sheet1
+
+
+class FixtureClient:
+    """Stands in for the authorized gspread client: open() → compliance, open_by_url() → actions."""
+
+    def __init__(self, compliance_rows, action_rows):
+        self._compliance = FixtureSpreadsheet(compliance_rows)
+        self._actions = FixtureSpreadsheet(action_rows)
+
+    def open(self, name):
+        return self._compliance
+
+    def open_by_url(self, url):
+        return self._actions
+
+
+def init_worker(compliance_rows, action_rows, start):
+    """Point one worker process's gspread at the fixture before it runs a session."""
+    global _start, _baseline_rss
+    client = FixtureClient(compliance_rows, action_rows)
+    mock.patch("gspread.authorize", return_value=client).start()
+    mock.patch("google.oauth2.service_account.Credentials.from_service_account_info", return_value=None).start()
+    # The scripts open images by relative path
+    os.chdir(APP_DIR)
+    _start = start
+    # Load everything the dashboards import, so a session's RSS increment excludes it
+    for module in ("gspread", "numpy", "pandas", "plotly.express", "streamlit"):
+        importlib.import_module(module)
+    _baseline_rss = rss_mb()
+
+
+# ---------------------- SESSION SCENARIOS ----------------------
+
+def pick(widget, rng):
+    """Select one real option (other than 'All') on a multiselect."""
+    return widget.unselect("All").select(rng.choice([o for o in widget.options if o != "All"]))
+
+
+def choose(widget, rng, exclude=("All", "None")):
+    """Select one real option on a selectbox, whatever values the fixture holds."""
+    return widget.select(rng.choice([o for o in widget.options if o not in exclude]))
+
+
+def compliance_session(at, rng):
+    """An officer narrowing the facility dashboard down and resetting it."""
+    yield "load", at.run
+    yield "select district", choose(at.selectbox(key="district"), rng).run
+    yield "select gender", choose(at.selectbox(key="gender"), rng).run
+    yield "compliance filter", at.selectbox(key="compliance").select("<= 50%").run
+    yield "facility filter", choose(at.selectbox(key="facility_filter"), rng).run
+    yield "apply", at.button(key="apply").click().run
+    # Any full rerun re-checks the snapshot version; here no response has arrived
+    yield "rerun", at.run
+    yield "clear", at.button(key="clear").click().run
+
+
+def actions_session(at, rng):
+    """An officer filtering and searching the action log, then downloading it."""
+    yield "load", at.run
+    yield "filter district", pick(at.multiselect(key="filter_District"), rng).run
+    yield "filter action", pick(at.multiselect(key="filter_Action"), rng).run
+    yield "search", at.text_input(key="Search").input(rng.choice(["govt", "warning", "proxy"])).run
+    # A download click reruns the script, which rebuilds the filtered CSV
+    yield "download", at.run
+    yield "clear search", at.text_input(key="Search").input("").run
+
+
+SCENARIOS = {
+    "compliance": compliance_session,
+    "actions": actions_session,
+}
+
+
+def run_session(app, session_id, iterations, timeout):
+    """
+    Replay the app's scenario in this worker process; returns a dict with the
+    rerun latencies in seconds, error messages, CPU seconds, and the worker's
+    RSS before and after the session.
+    """
+    latencies, errors = [], []
+    rng = random.Random(session_id)
+    # Hold every session until all worker processes are up, so they overlap
+    _start.wait(timeout=timeout)
+    cpu0 = time.process_time()
+
+    for _ in range(iterations):
+        at = AppTest.from_file(os.path.join(APP_DIR, APPS[app]), default_timeout=timeout)
+        at.secrets["gcp_service_account"] = {}
+        steps = SCENARIOS[app](at, rng)
+        while True:
+            # Widget lookups need the previous run's element tree, so build each step lazily
+            try:
+                step, rerun = next(steps)
+            except StopIteration:
+                break
+            except Exception as e:
+                errors.append(f"{app}: could not prepare next step: {e!r}")
+                break
+            t0 = time.perf_counter()
+            try:
+                rerun()
+            except Exception as e:
+                errors.append(f"{app} [{step}]: {e!r}")
+                break
+            latencies.append(time.perf_counter() - t0)
+            if at.exception:
+                errors.append(f"{app} [{step}]: {at.exception[0].message}")
+                break
+
+    return {
+        "latencies": latencies,
+        "errors": errors,
+        "cpu_s": time.process_time() - cpu0,
+        "baseline_rss_mb": _baseline_rss,
+        "rss_mb": rss_mb(),
+    }
+
+
+# ---------------------- MEASUREMENT ----------------------
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def rss_mb():
+    """Current resident set size, falling back to the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def measure(app, sessions, iterations, timeout, fixture):
+    """Run `sessions` concurrent sessions of `app`, one process each, and summarize them."""
+    ctx = multiprocessing.get_context("spawn")
+    start = ctx.Barrier(sessions)
+    wall0 = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=sessions, mp_context=ctx,
+                             initializer=init_worker, initargs=(*fixture, start)) as pool:
+        futures = [pool.submit(run_session, app, i, iterations, timeout) for i in range(sessions)]
+        results = [f.result() for f in futures]
+
+    wall = time.perf_counter() - wall0
+    latencies = [lat for r in results for lat in r["latencies"]]
+    errors = [err for r in results for err in r["errors"]]
+    cpu = sum(r["cpu_s"] for r in results)
+    baseline = sum(r["baseline_rss_mb"] for r in results) / sessions
+    increments = [r["rss_mb"] - r["baseline_rss_mb"] for r in results]
+
+    return {
+        "app": app,
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000 if latencies else None,
+        "p95_ms": percentile(latencies, 95) * 1000 if latencies else None,
+        "p99_ms": percentile(latencies, 99) * 1000 if latencies else None,
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "cpu_ms_per_rerun": cpu / len(latencies) * 1000 if latencies else None,
+        "process_rss_mb": sum(r["rss_mb"] for r in results),
+        "baseline_rss_mb": baseline,
+        "rss_mb_per_session": sum(increments) / sessions,
+        "estimated_server_rss_mb": baseline + sum(increments),
+        "errors": errors,
+    }
+
+
+def print_report(results):
+    header = f"{'app':<11} {'sessions':>8} {'reruns':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} " \
+             f"{'CPU s':>7} {'CPU ms/run':>10} {'proc MB':>8} {'MB/sess':>8} {'est. MB':>8} {'errors':>6}"
+    print(header)
+    print("-" * len(header))
+
+    def fmt(value):
+        return "-" if value is None else f"{value:.0f}"
+
+    for r in results:
+        print(f"{r['app']:<11} {r['sessions']:>8} {r['reruns']:>7} {fmt(r['p50_ms']):>8} {fmt(r['p95_ms']):>8} "
+              f"{fmt(r['p99_ms']):>8} {r['cpu_s']:>7.1f} {fmt(r['cpu_ms_per_rerun']):>10} "
+              f"{r['process_rss_mb']:>8.0f} {r['rss_mb_per_session']:>8.0f} {r['estimated_server_rss_mb']:>8.0f} "
+              f"{len(r['errors']):>6}")
+    for r in results:
+        for err in r["errors"][:3]:
+            print(f"  ! {r['sessions']} sessions, {err}")
+
+
+# ---------------------- CLI ----------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the monitoring dashboards.")
+    parser.add_argument("--app", choices=["compliance", "actions", "both"], default="both")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 20],
+                        help="concurrent session counts to measure")
+    parser.add_argument("--iterations", type=int, default=3, help="scenario repetitions per session")
+    parser.add_argument("--colleges", type=int, default=300, help="colleges in the generated fixture")
+    parser.add_argument("--actions-per-college", type=int, default=4)
+    parser.add_argument("--fixture-dir", help="use compliance.csv and actions.csv from here instead of generated data")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds allowed per rerun")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this file")
+    parser.add_argument("--fail-p95-ms", type=float, help="exit with status 1 if any p95 exceeds this")
+    args = parser.parse_args(argv)
+
+    if args.fixture_dir:
+        compliance_rows, action_rows = read_fixture(args.fixture_dir)
+    else:
+        compliance_rows, action_rows = generate_fixture(args.colleges, args.actions_per_college)
+    apps = list(APPS) if args.app == "both" else [args.app]
+
+    results = []
+    for app in apps:
+        for sessions in args.sessions:
+            results.append(measure(app, sessions, args.iterations, args.timeout, (compliance_rows, action_rows)))
+            print(f"{app}: {sessions} sessions done", file=sys.stderr)
+
+    print_report(results)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    failed = any(r["errors"] for r in results)
+    if args.fail_p95_ms is not None:
+        failed |= any(r["p95_ms"] is None or r["p95_ms"] > args.fail_p95_ms for r in results)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
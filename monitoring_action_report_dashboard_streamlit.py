@@ -3,11 +3,11 @@ import gspread
 from google.oauth2.service_account import Credentials
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.express as px
 import base64
-import re
 import os
+from college_data import (ACTION_SHEET_URL, COMPLIANCE_COLLEGE_POSITION, CROSS_SHEET_ERRORS, action_frame,
+                          join_compliance_actions, load_compliance_records)
 
 # ---------------------- CONFIG ----------------------
 
@@ -18,7 +18,7 @@ st.set_page_config(
 )
 
 # ---------------------- GOOGLE SHEET CONFIG ----------------------
-DEFAULT_SHEET_URL = "https://docs.google.com/spreadsheets/d/1CaRv9M_Xvs0xu0RSWR_NGvNE0SGC3XqCzoEbqQAuoqc/edit"
+DEFAULT_SHEET_URL = ACTION_SHEET_URL
 
 # ---------------------- UTILS ----------------------
 
@@ -26,30 +26,6 @@ def get_base64_image(image_path):
     with open(image_path, "rb") as f:
         return base64.b64encode(f.read()).decode()
 
-def merge_duplicate_columns(df: pd.DataFrame):
-    """
-    Properly merge duplicate columns (like 'Action', 'Action_1', 'Action_2', etc.)
-    by taking the first non-empty value in each row across all duplicates.
-    Works even if Google Sheets repeated headers multiple times.
-    """
-    merged_df = df.copy()
-    base_map = {}
-
-    for col in merged_df.columns:
-        base = re.sub(r'[_\.\s]*\d+$', '', col.strip())
-        base_map.setdefault(base, []).append(col)
-
-    for base, cols in base_map.items():
-        if len(cols) > 1:
-            merged_df[base] = merged_df[cols].apply(
-                lambda row: next((x for x in row if pd.notna(x) and str(x).strip() != ''), ''),
-                axis=1
-            )
-            merged_df.drop(columns=[c for c in cols if c != base], inplace=True)
-
-    return merged_df
-
-
 def load_data():
     """Always load directly from Google Sheet."""
     scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
@@ -64,36 +40,7 @@ def load_data():
         st.error("No data found in the Google Sheet.")
         st.stop()
 
-    headers = rows[0]
-    data = rows[1:]
-
-    # Handle duplicate headers
-    unique_headers = []
-    seen = {}
-    for h in headers:
-        if h in seen:
-            seen[h] += 1
-            unique_headers.append(f"{h}_{seen[h]}")
-        else:
-            seen[h] = 0
-            unique_headers.append(h)
-
-    df = pd.DataFrame(data, columns=unique_headers)
-
-    # Clean column names
-    df.columns = [c.strip().replace("-", "_") for c in df.columns]
-
-    # Merge duplicate logical columns
-    df = merge_duplicate_columns(df)
-
-    # Ensure essential columns exist
-    for col in ['Scale', 'Reason', 'Category']:
-        if col not in df.columns:
-            df[col] = np.nan
-
-    df['Scale'] = pd.to_numeric(df['Scale'], errors='coerce')
-
-    return df
+    return action_frame(rows)
 
 
 def multi_filter(df, key):
@@ -240,6 +187,33 @@ if 'Action' in df.columns:
 
 st.markdown("---")
 
+# ---------------------- COMPLIANCE VS ACTIONS ----------------------
+
+st.subheader("Facility Compliance vs Actions")
+
+try:
+    compliance = load_compliance_records()
+    compliance_actions = None
+    if not compliance.empty and 'College Name' in df.columns:
+        compliance_actions = join_compliance_actions(
+            compliance, compliance.columns[COMPLIANCE_COLLEGE_POSITION], df, how='right'
+        )
+except CROSS_SHEET_ERRORS:
+    st.warning("The facility compliance sheet could not be read, so this section is skipped.")
+    compliance_actions = None
+
+if compliance_actions is not None:
+    compliance_actions['Compliance %'] = compliance_actions['Compliance %'].apply(
+        lambda x: f"{int(x)}%" if pd.notna(x) else "Not visited"
+    )
+    st.dataframe(
+        compliance_actions,
+        height=400,
+        hide_index=True
+    )
+
+st.markdown("---")
+
 # ---------------------- TABLE & DOWNLOAD ----------------------
 
 st.subheader("Detailed Records")